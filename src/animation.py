@@ -4,7 +4,8 @@ import random
 import numpy as np
 import pygame
 
-from typing import List, Tuple
+from pygame import gfxdraw
+from typing import List, Optional, Sequence, Tuple
 
 
 class Sprite:
@@ -23,7 +24,7 @@ class RotatingSprite(Sprite):
     Basic rotating sprite from a list of Surfaces + rect (since rotated images can have different sizes).
     """
 
-    def __init__(self, frames: List[pygame.Surface]):
+    def __init__(self, frames: Sequence[Tuple[pygame.Surface, pygame.Rect]]):
         self._frames = frames
         self._index = 0
 
@@ -44,11 +45,18 @@ class GifSprite(Sprite):
     """
     Basic static sprite from a list of Surfaces. Uses per-pixel alpha since it has been conceived for Pokemon sprite
     gifs. Assumes all frames to be of the same size. Needs to be provided a position to be drawn properly. Can be
-    updated via `set_position`.
+    updated via `set_position`. Repeated frames can be given once, along with the index of each frame's Surface.
     """
 
-    def __init__(self, frames: List[pygame.Surface], position: Tuple[int, int] = (0, 0)):
+    def __init__(self, frames: List[pygame.Surface], position: Tuple[int, int] = (0, 0),
+                 index_map: List[int] = None):
+        """
+        :param frames: The Surfaces of the animation.
+        :param position: Position of the center of the gif.
+        :param index_map: Optional. Index in `frames` of each animation frame, if not given frames are shown in order.
+        """
         self._frames = frames
+        self._index_map = index_map or list(range(len(frames)))
         self._index = 0
 
         shift_x, shift_y = self._frames[0].get_width() // 2, self._frames[0].get_height() // 2
@@ -56,14 +64,14 @@ class GifSprite(Sprite):
 
     def draw(self, surface: pygame.Surface):
         # Draw next frame (looping back to the first if we ran out).
-        frame = self._frames[self._index]
+        frame = self._frames[self._index_map[self._index]]
         surface.blit(frame, (self._position[0], self._position[1]))
-        self._index = (self._index + 1) % len(self._frames)
+        self._index = (self._index + 1) % len(self._index_map)
 
     def rewind(self, surface: pygame.Surface, frames: int = 1):
         # Draw a previous frame and set back the index, effectively rewind the animation.
-        self._index = (self._index - frames) % len(self._frames)
-        frame = self._frames[self._index]
+        self._index = (self._index - frames) % len(self._index_map)
+        frame = self._frames[self._index_map[self._index]]
         surface.blit(frame, (self._position[0], self._position[1]))
 
     def set_position(self, position: Tuple[int, int]):
@@ -71,6 +79,15 @@ class GifSprite(Sprite):
         shift_x, shift_y = self._frames[0].get_width() // 2, self._frames[0].get_height() // 2
         self._position = (position[0] - shift_x, position[1] - shift_y)
 
+    def convert_alpha(self):
+        # Convert frames to the display's pixel format with per-pixel alpha, so blits take the fast path.
+        # Needs the display mode to be set. Repeated frames are converted once.
+        converted = {}
+        for frame in self._frames:
+            if id(frame) not in converted:
+                converted[id(frame)] = frame.convert_alpha()
+        self._frames = [converted[id(frame)] for frame in self._frames]
+
 
 class Bubble(Sprite):
     """
@@ -81,7 +98,7 @@ class Bubble(Sprite):
     def __init__(self, color: Tuple[int, int, int], position: Tuple[int, int], speed: Tuple[float, float],
                  growth: float, lifespan: int, downtime: int, max_alpha: int):
         """
-        :param color: Color of the bubble. Any except black which is used for color keying.
+        :param color: Color of the bubble.
         :param position: Position of the center of the bubble in the surface given to draw.
         :param speed: X and Y speed at each frame.
         :param growth: The radius growth rate in pixels per frame.
@@ -89,54 +106,82 @@ class Bubble(Sprite):
         :param downtime: How many frames to wait before starting over.
         :param max_alpha: The alpha at the start of each animation cycle.
         """
-        # Color can be changed from outside.
-        self.color = color
-
         # The rest has to remain constant.
         self._scene_pos = position
         self._growth = growth
         self._lifespan = lifespan
         self._downtime = downtime
+        self._max_alpha = max_alpha
 
         self._index = 0
-        self._radius = [int(r) for r in np.arange(0, growth * lifespan, growth)] + [0] * downtime
-        self._opacity = [int(o) for o in np.arange(max_alpha, 0, - max_alpha / lifespan)] + [0] * downtime
 
-        # Temporary surface as big as we could need.
-        self._width, self._height = growth * lifespan * 2, growth * lifespan * 2
-        self._center = (self._width // 2, self._height // 2)
-        self._shift_x = [int(x) for x in np.arange(0, lifespan * speed[0], speed[0])] + [0] * downtime
-        self._shift_y = [int(y) for y in np.arange(0, lifespan * speed[1], speed[1])] + [0] * downtime
+        # Center of the bubble at each frame of its lifespan, offset as if drawn on a surface as big as we could need.
+        width, height = growth * lifespan * 2, growth * lifespan * 2
+        start = np.array([int(position[0] + width // 2), int(position[1] + height // 2)], dtype=np.int32)
+        centers = np.outer(np.arange(lifespan), speed).astype(np.int32) + start
+        self._centers = [tuple(c) for c in centers.tolist()]
+
+        # Color is baked into the frames, so it can't be changed afterwards.
+        self._color = color
+        self._frames = self._make_frames()
 
-        self._surf = pygame.surface.Surface((self._width, self._height))
-        self._surf.set_colorkey((0, 0, 0))
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        return self._color
 
     def draw(self, surface: pygame.Surface):
         # Draw next frame (looping back to the first if we ran out).
         self._draw(surface)
-        self._index = (self._index + 1) % len(self._radius)
+        self._index = (self._index + 1) % len(self._frames)
 
     def rewind(self, surface: pygame.Surface, frames: int = 1):
         # Draw a previous frame and set back the index, effectively rewind the animation.
-        self._index = (self._index - frames) % len(self._radius)
+        self._index = (self._index - frames) % len(self._frames)
         self._draw(surface)
 
     def randomize(self):
         # Choose random frame.
-        self._index = random.randint(0, len(self._radius) - 1)
+        self._index = random.randint(0, len(self._frames) - 1)
+
+    @staticmethod
+    def draw_all(surface: pygame.Surface, bubbles: List["Bubble"]):
+        # Draw the next frame of all the bubbles in a single pass, same as calling `draw` on each.
+        circle = gfxdraw.filled_circle
+        for bubble in bubbles:
+            frames, index = bubble._frames, bubble._index
+            frame = frames[index]
+            if frame is not None:
+                circle(surface, *frame)
+            bubble._index = (index + 1) % len(frames)
+
+    @staticmethod
+    def rewind_all(surface: pygame.Surface, bubbles: List["Bubble"], frames: int = 1):
+        # Rewind all the bubbles in a single pass, same as calling `rewind` on each.
+        circle = gfxdraw.filled_circle
+        for bubble in bubbles:
+            bubble._index = (bubble._index - frames) % len(bubble._frames)
+            frame = bubble._frames[bubble._index]
+            if frame is not None:
+                circle(surface, *frame)
+
+    def _make_frames(self) -> List[Optional[Tuple[int, int, int, Tuple[int, int, int, int]]]]:
+        # Pre-compute center, radius and color of each frame, None if there is nothing to draw (too small, transparent
+        # or during downtime).
+        # Every frame has its own radius and alpha, so pre-rendering them as Surfaces would take tens of MB per
+        # bubble: the circle is blended straight onto the target instead.
+        steps = np.arange(self._lifespan)
+        radius = (steps * self._growth).astype(np.int32)
+        opacity = np.linspace(self._max_alpha, 0, self._lifespan, endpoint=False).astype(np.int32)
+        frames = [
+            (*center, r, (*self._color, o)) if r and o else None
+            for center, r, o in zip(self._centers, radius.tolist(), opacity.tolist())
+        ]
+        return frames + [None] * self._downtime
 
     def _draw(self, surface: pygame.Surface):
-        index = self._index
-        radius = self._radius[index]
-        if not radius:
-            return  # No need to blit (either during downtime or too small).
-
-        surf = self._surf
-        surf.fill((0, 0, 0))
-
-        # Draw circle with correct size.
-        pygame.draw.circle(surf, self.color, self._center, radius)
-        surf.set_alpha(self._opacity[index])
+        frame = self._frames[self._index]
+        if frame is None:
+            return  # No need to draw.
 
-        pos = (self._scene_pos[0] + self._shift_x[index], self._scene_pos[1] + self._shift_y[index])
-        surface.blit(surf, pos)
+        # Alpha blended filled circle, no temporary surface or blit needed.
+        gfxdraw.filled_circle(surface, *frame)
@@ -1,6 +1,8 @@
 import os
+import asyncio
+import email.utils
 
-import requests
+import aiohttp
 
 from bs4 import BeautifulSoup
 
@@ -10,6 +12,9 @@ CRIES_DIR = "poke-data/cries/"
 SPRITES_ROOT = "http://play.pokemonshowdown.com/sprites/gen5ani/"
 SPRITES_DIR = "poke-data/sprites/"
 
+# How many files to download at once, over pooled connections.
+MAX_CONNECTIONS = 16
+
 
 def is_ogg_cry(href: str):
     # Want only base pokemon in .ogg format.
@@ -21,28 +26,55 @@ def is_gif_sprite(href: str):
     return href and href.endswith(".gif") and len(href.split("-")) == 1
 
 
+async def fetch(session: aiohttp.ClientSession, url: str) -> bytes:
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.read()
+
+
+async def download(session: aiohttp.ClientSession, root: str, directory: str, name: str, kind: str):
+    # Download a single file from root to directory, unless the local copy is still up to date.
+    destination = directory + name
+    headers = {}
+    if os.path.exists(destination) and os.path.getsize(destination) > 0:
+        headers["If-Modified-Since"] = email.utils.formatdate(os.path.getmtime(destination), usegmt=True)
+
+    async with session.get(root + name, headers=headers) as response:
+        if response.status == 304:
+            print(f"Already got {kind} for {name}.")
+            return
+        # Never write an error page over a good local copy.
+        response.raise_for_status()
+        data = await response.read()
+
+    # Write aside and then move in place, so an interrupted run can't leave a truncated file that looks up to date.
+    partial = destination + ".part"
+    with open(partial, "wb+") as f:
+        f.write(data)
+    os.replace(partial, destination)
+    print(f"Got {kind} for {name}.")
+
+
+async def download_all(session: aiohttp.ClientSession, root: str, directory: str, is_wanted, kind: str):
+    # Download all the wanted files linked in the root's index page.
+    page = await fetch(session, root)
+    soup = BeautifulSoup(page, 'lxml')
+    names = [link.get("href") for link in soup.find_all(href=is_wanted)]
+    await asyncio.gather(*(download(session, root, directory, name, kind) for name in names))
+
+
+async def download_pokemon():
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Download cries.
+        await download_all(session, CRIES_ROOT, CRIES_DIR, is_ogg_cry, "cry")
+
+        # Download gen 5 gifs.
+        await download_all(session, SPRITES_ROOT, SPRITES_DIR, is_gif_sprite, "sprite")
+
+
 def main():
-    # Download cries.
-    cries_page = requests.get(CRIES_ROOT).content
-    soup = BeautifulSoup(cries_page, 'html.parser')
-    for link in soup.find_all(href=is_ogg_cry):
-        name = link.get("href")
-        destination = CRIES_ROOT + name
-        cry = requests.get(destination).content
-        with open(CRIES_DIR + name, "wb+") as f:
-            f.write(cry)
-        print(f"Got cry for {name}.")
-
-    # Download gen 5 gifs.
-    sprites_page = requests.get(SPRITES_ROOT).content
-    soup = BeautifulSoup(sprites_page, 'html.parser')
-    for link in soup.find_all(href=is_gif_sprite):
-        name = link.get("href")
-        destination = SPRITES_ROOT + name
-        gif = requests.get(destination).content
-        with open(SPRITES_DIR + name, "wb+") as f:
-            f.write(gif)
-        print(f"Got sprite for {name}.")
+    asyncio.run(download_pokemon())
 
 
 if __name__ == "__main__":
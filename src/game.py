@@ -1,10 +1,9 @@
 import ctypes
-import math
 from typing import Union, List, Callable
 
 import pygame
 import src.utils as utils
-from animation import RotatingSprite
+from animation import Bubble, RotatingSprite
 from poke import Pokemon
 from song import SongPair, WavSong, EmptySong, SongMeta
 from visualizers import RingVisualizer, BarVisualizer
@@ -19,11 +18,18 @@ class SongGame:
     # Would be Space.
     NEXT_KEY = 32
 
+    # Events handled by the game loop, any other is blocked.
+    EVENTS = [pygame.QUIT, pygame.KEYUP, pygame.MOUSEBUTTONUP]
+
+    # Full screen, presented by the GPU with page flipping.
+    DISPLAY_FLAGS = pygame.SCALED | pygame.DOUBLEBUF | pygame.FULLSCREEN
+
     # Song title font size.
     FONT_SIZE = 64
 
     # Vinyl record.
     VINYL_SIZE = (380, 380)
+    _VINYL_SIZE_SQ = VINYL_SIZE[0] * VINYL_SIZE[0]
     VINYL_SPEED = 0.5
     VINYL_REWIND_SPEED = 15
 
@@ -71,17 +77,14 @@ class SongGame:
         # The two audio visualizers.
         self._ring_viz = None
         self._bar_viz = None
-        self._draw_viz = None  # Drawing behaviour function.
+        self._bar_song = None  # Songs visualized by each visualizer.
+        self._ring_song = None
         self._background_color = (0, 0, 0)
         self._foreground_color = (255, 255, 255)
 
-        # Vinyl record sprite.
-        self._vinyl = RotatingSprite(utils.make_frames(
-            vinyl_path, SongGame.VINYL_SIZE,
-            (self._center[0] - SongGame.VINYL_SIZE[0] // 2,
-             self._center[1] - SongGame.VINYL_SIZE[1] // 2),
-            SongGame.VINYL_SPEED
-        ))
+        # Vinyl record sprite, made once the display is set.
+        self._vinyl_path = vinyl_path
+        self._vinyl = None
         self._rewind = WavSong(rewind_path)
 
         # Bubbles.
@@ -110,9 +113,21 @@ class SongGame:
     def start(self):
         # Init game song-data.
         self._clock = pygame.time.Clock()
-        self._screen = pygame.display.set_mode(self._true_res)
-        self._scene = pygame.Surface(self._true_res)
-        self._scene.convert_alpha()
+        self._screen = pygame.display.set_mode(self._true_res, SongGame.DISPLAY_FLAGS, vsync=1)
+        # Draw straight onto the display surface, no intermediate copy.
+        self._scene = self._screen
+
+        # Only queue the events we handle.
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(SongGame.EVENTS)
+
+        # Vinyl frames are converted to the display's format.
+        self._vinyl = RotatingSprite(utils.make_frames(
+            self._vinyl_path, SongGame.VINYL_SIZE,
+            (self._center[0] - SongGame.VINYL_SIZE[0] // 2,
+             self._center[1] - SongGame.VINYL_SIZE[1] // 2),
+            SongGame.VINYL_SPEED
+        ))
 
         self._ring_viz = RingVisualizer(
             self._scene,
@@ -148,7 +163,7 @@ class SongGame:
         # Not actually a game "loop", might actually take time
         # for more complex logic spanning multiple loops (e.g. rewinding).
 
-        for event in pygame.event.get():
+        for event in pygame.event.get(SongGame.EVENTS):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -163,18 +178,16 @@ class SongGame:
                         self._change_song(self._solutions[self._index])
             if event.type == pygame.MOUSEBUTTONUP and not self._showing_solution:
                 # If vinyl was clicked (190 pixels from the center), rewind song.
-                x, y = pygame.mouse.get_pos()
-                distance = math.sqrt((x - self._scene.get_width() / 2) ** 2 + (y - self._scene.get_height() / 2) ** 2)
-                if distance < SongGame.VINYL_SIZE[0]:
+                dx, dy = event.pos[0] - self._center[0], event.pos[1] - self._center[1]
+                if dx * dx + dy * dy < SongGame._VINYL_SIZE_SQ:
                     # Play rewind sound and then restore the old song.
                     old_song = self._song
                     self._change_song(self._rewind)
                     while self._song.playing:
                         self._scene.fill(self._background_color)
-                        self._rewind_bubbles()
+                        Bubble.rewind_all(self._scene, self._bubbles, SongGame.BUBBLES_REWIND_SPEED)
                         self._vinyl.rewind(self._scene, SongGame.VINYL_REWIND_SPEED)
                         self._ring_viz.draw(self._song)
-                        self._screen.blit(self._scene, (0, 0))
                         pygame.display.flip()
                     self._change_song(old_song)
                     break  # Avoid doing this for multiple click events.
@@ -190,9 +203,9 @@ class SongGame:
 
         # Change behaviour based on Song type.
         if isinstance(self._song, SongPair):
-            self._draw_viz = self._draw_song_pair
+            self._bar_song, self._ring_song = self._song.base, self._song.vocals
         else:
-            self._draw_viz = self._draw_normal_song
+            self._bar_song, self._ring_song = self._song, self._song
 
         self._song.play()
 
@@ -208,50 +221,29 @@ class SongGame:
         self._ring_viz.color = self._foreground_color
         self._bar_viz.color = self._foreground_color
 
-        # Make new bubbles and set their color.
-        self._bubbles = utils.random_bubbles(SongGame.BUBBLES, self._true_res)
-        for b in self._bubbles:
-            b.color = self._foreground_color
+        # Make new bubbles with the level's color.
+        self._bubbles = utils.random_bubbles(SongGame.BUBBLES, self._true_res, self._foreground_color)
 
-        self._text_surface = self._font.render(self._song_names[self._index], True, self._foreground_color)
+        self._text_surface = utils.render_text(self._font, self._song_names[self._index], self._foreground_color)
         self._text_rect = self._text_surface.get_rect(center=(self._true_res[0] / 2, 100))
 
     def _draw(self):
-        self._scene.fill(self._background_color)
+        scene = self._scene
+        scene.fill(self._background_color)
 
-        # Draw bubbles
-        self._draw_bubbles()
-
-        # Draw vinyl record
-        self._vinyl.draw(self._scene)
-
-        # Only visualize Song if it is playing.
+        # Draw bubbles, vinyl record and, only if the Song is playing, the visualizers.
+        Bubble.draw_all(scene, self._bubbles)
+        self._vinyl.draw(scene)
         if self._song.playing:
-            self._draw_viz()
+            self._bar_viz.draw(self._bar_song)
+            self._ring_viz.draw(self._ring_song)
 
         # Only show title if showing solution.
         if self._showing_solution:
-            self._scene.blit(self._text_surface, self._text_rect)
+            scene.blit(self._text_surface, self._text_rect)
 
-        self._screen.blit(self._scene, (0, 0))
         pygame.display.flip()
 
-    def _draw_bubbles(self):
-        for bubble in self._bubbles:
-            bubble.draw(self._scene)
-
-    def _rewind_bubbles(self):
-        for bubble in self._bubbles:
-            bubble.rewind(self._scene, SongGame.BUBBLES_REWIND_SPEED)
-
-    def _draw_normal_song(self):
-        self._bar_viz.draw(self._song)
-        self._ring_viz.draw(self._song)
-
-    def _draw_song_pair(self):
-        self._bar_viz.draw(self._song.base)
-        self._ring_viz.draw(self._song.vocals)
-
 
 class PokeGame:
     """
@@ -263,11 +255,18 @@ class PokeGame:
     # Would be Z key.
     HINT_KEY = 122
 
+    # Events handled by the game loop, any other is blocked.
+    EVENTS = [pygame.QUIT, pygame.KEYUP, pygame.MOUSEBUTTONUP]
+
+    # Full screen, presented by the GPU with page flipping.
+    DISPLAY_FLAGS = pygame.SCALED | pygame.DOUBLEBUF | pygame.FULLSCREEN
+
     # Song title font size.
     FONT_SIZE = 64
 
     # Vinyl record.
     VINYL_SIZE = (380, 380)
+    _VINYL_SIZE_SQ = VINYL_SIZE[0] * VINYL_SIZE[0]
     VINYL_SPEED = 0.5
     VINYL_REWIND_SPEED = 15
 
@@ -338,9 +337,18 @@ class PokeGame:
     def start(self):
         # Init game song-data.
         self._clock = pygame.time.Clock()
-        self._screen = pygame.display.set_mode(self._true_res)
-        self._scene = pygame.Surface(self._true_res)
-        self._scene.convert_alpha()
+        self._screen = pygame.display.set_mode(self._true_res, PokeGame.DISPLAY_FLAGS, vsync=1)
+        # Draw straight onto the display surface, no intermediate copy.
+        self._scene = self._screen
+
+        # Only queue the events we handle.
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(PokeGame.EVENTS)
+
+        # Now that there is a display, convert the sprites to its format.
+        for p in self._pokemon:
+            p.sprite.convert_alpha()
+            p.silhouette.convert_alpha()
 
         self._ring_viz = RingVisualizer(
             self._scene,
@@ -366,7 +374,7 @@ class PokeGame:
         # Not actually a game "loop", might actually take time
         # for more complex logic spanning multiple loops (e.g. rewinding).
 
-        for event in pygame.event.get():
+        for event in pygame.event.get(PokeGame.EVENTS):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
@@ -387,9 +395,8 @@ class PokeGame:
                     self._showing_hint = True
             if event.type == pygame.MOUSEBUTTONUP and not self._showing_solution:
                 # If vinyl was clicked (190 pixels from the center), rewind pokemon cry.
-                x, y = pygame.mouse.get_pos()
-                distance = math.sqrt((x - self._scene.get_width() / 2) ** 2 + (y - self._scene.get_height() / 2) ** 2)
-                if distance < SongGame.VINYL_SIZE[0]:
+                dx, dy = event.pos[0] - self._center[0], event.pos[1] - self._center[1]
+                if dx * dx + dy * dy < PokeGame._VINYL_SIZE_SQ:
                     # Play the pokemon cry again.
                     self._song.reset()
                     self._song.play()
@@ -427,19 +434,17 @@ class PokeGame:
         self._ring_viz.color = self._foreground_color
         self._bar_viz.color = self._foreground_color
 
-        # Make new bubbles and set their color.
-        self._bubbles = utils.random_bubbles(SongGame.BUBBLES, self._true_res)
-        for b in self._bubbles:
-            b.color = self._foreground_color
+        # Make new bubbles with the level's color.
+        self._bubbles = utils.random_bubbles(SongGame.BUBBLES, self._true_res, self._foreground_color)
 
-        self._text_surface = self._font.render(self._pokemon[self._index].name, True, self._foreground_color)
+        self._text_surface = utils.render_text(self._font, self._pokemon[self._index].name, self._foreground_color)
         self._text_rect = self._text_surface.get_rect(center=(self._true_res[0] / 2, 100))
 
     def _draw(self):
         self._scene.fill(self._background_color)
 
         # Draw bubbles
-        self._draw_bubbles()
+        Bubble.draw_all(self._scene, self._bubbles)
 
         # Only visualize Song if it is playing.
         if self._song.playing:
@@ -454,9 +459,4 @@ class PokeGame:
         if self._showing_hint:
             self._pokemon[self._index].silhouette.draw(self._scene)
 
-        self._screen.blit(self._scene, (0, 0))
         pygame.display.flip()
-
-    def _draw_bubbles(self):
-        for bubble in self._bubbles:
-            bubble.draw(self._scene)
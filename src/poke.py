@@ -3,7 +3,55 @@ import pygame
 
 from song import WavSong
 from animation import GifSprite
-from typing import Tuple
+from typing import List, Tuple
+
+# A frame as plain picklable data: pixel bytes, size and pixel format.
+RawFrame = Tuple[bytes, Tuple[int, int], str]
+
+
+def load_pokemon_raw(name: str, sprite_path: str, cry_path: str) -> Tuple[str, str, List[RawFrame], List[RawFrame]]:
+    """
+    Decode and resize the frames of a Pokemon's sprite and silhouette. Only returns plain data so that it can run in a
+    worker process, `Pokemon` turns the frames back into Surfaces.
+
+    :param name: The Pokemon's name.
+    :param sprite_path: The gif file with the Pokemon's sprite.
+    :param cry_path: The wav file with the Pokemon's cry.
+    :return: The name and cry path, as given, and the raw sprite and silhouette frames.
+    """
+    # Load gif data.
+    frames = utils.split_gif(sprite_path)
+    sil_frames = utils.make_silhouette(frames)
+
+    # Resize
+    frames = [utils.min_resize(f, Pokemon.IMAGE_SIZE) for f in frames]
+    sil_frames = [utils.min_resize(f, Pokemon.IMAGE_SIZE) for f in sil_frames]
+
+    return name, cry_path, [_to_raw(f) for f in frames], [_to_raw(f) for f in sil_frames]
+
+
+def _to_raw(surface: pygame.Surface) -> RawFrame:
+    return pygame.image.tostring(surface, "RGB"), surface.get_size(), "RGB"
+
+
+def _from_raw(frame: RawFrame) -> pygame.Surface:
+    # Back to a Surface, color keyed on (0,0,0) like the ones from `utils.split_gif`.
+    surface = pygame.image.frombuffer(*frame)
+    surface.set_colorkey((0, 0, 0))
+    return surface
+
+
+def _unique_from_raw(frames: List[RawFrame]) -> Tuple[List[pygame.Surface], List[int]]:
+    # Surfaces for the distinct frames only, along with the index of each frame's Surface.
+    surfaces = []
+    index_map = []
+    seen = {}
+    for f in frames:
+        if f not in seen:
+            seen[f] = len(surfaces)
+            surfaces.append(_from_raw(f))
+        index_map.append(seen[f])
+    return surfaces, index_map
 
 
 class Pokemon:
@@ -15,27 +63,24 @@ class Pokemon:
     TARGET_FPS = 60
     IMAGE_SIZE = 360
 
-    def __init__(self, name: str, sprite_path: str, cry_path: str):
+    def __init__(self, name: str, cry_path: str, frames: List[RawFrame], sil_frames: List[RawFrame]):
         """
-        :param sprite_path: The gif file with the Pokemon's sprite.
         :param cry_path: The wav file with the Pokemon's cry.
+        :param frames: The sprite's frames, as given by `load_pokemon_raw`.
+        :param sil_frames: The silhouette's frames, as given by `load_pokemon_raw`.
         """
         self.name = name
 
         # Load cry wav file.
         self.cry = WavSong(cry_path)
 
-        # Load gif data.
-        frames = utils.split_gif(sprite_path)
-        sil_frames = utils.make_silhouette(frames)
-
-        # Resize
-        frames = [utils.min_resize(f, Pokemon.IMAGE_SIZE) for f in frames]
-        sil_frames = [utils.min_resize(f, Pokemon.IMAGE_SIZE) for f in sil_frames]
+        # Surfaces from the decoded frames, identical ones (common among silhouettes) are made once.
+        frames, index_map = _unique_from_raw(frames)
+        sil_frames, sil_index_map = _unique_from_raw(sil_frames)
 
         # Extend duration
-        frames = utils.extend_frame_duration(frames, Pokemon.DESIRED_FPS, Pokemon.TARGET_FPS)
-        sil_frames = utils.extend_frame_duration(sil_frames, Pokemon.DESIRED_FPS, Pokemon.TARGET_FPS)
+        index_map = utils.extend_frame_duration(index_map, Pokemon.DESIRED_FPS, Pokemon.TARGET_FPS)
+        sil_index_map = utils.extend_frame_duration(sil_index_map, Pokemon.DESIRED_FPS, Pokemon.TARGET_FPS)
 
-        self.sprite = GifSprite(frames)
-        self.silhouette = GifSprite(sil_frames)
+        self.sprite = GifSprite(frames, index_map=index_map)
+        self.silhouette = GifSprite(sil_frames, index_map=sil_index_map)
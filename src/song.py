@@ -1,28 +1,47 @@
 import wave
+import atexit
 import pyaudio
-import threading
 import numpy as np
 
-from scipy.fft import rfft
+from scipy.fft import rfft, next_fast_len
 
 # Idk kinda looked like it made sense I have no clue to be fair.
 RMS_POWER_CLIP = 10000
 
+# PyAudio instance shared by all the songs, made on first use.
+_PYAUDIO = None
 
-def normalized_fft(samples, pad):
-    # pad: Minimum required length of array
-    fft = np.abs(rfft(np.frombuffer(samples, np.int16)))
-    if fft.shape[0] < pad:
-        fft = np.concatenate((fft, np.array([0] * (pad - fft.shape[0]))))
-    norm = np.linalg.norm(fft)
-    return fft / (norm or 1)
 
+def shared_pyaudio() -> pyaudio.PyAudio:
+    # Get the shared PyAudio instance, terminated when the interpreter exits.
+    global _PYAUDIO
+    if _PYAUDIO is None:
+        _PYAUDIO = pyaudio.PyAudio()
+        atexit.register(_PYAUDIO.terminate)
+    return _PYAUDIO
 
-def rms_power(samples):
+
+def normalized_fft(samples: np.ndarray, pad: int) -> np.ndarray:
+    # samples: int16 samples, either one chunk or a matrix with one chunk per row.
+    # pad: Minimum required number of bins.
+    # Sizing the transform to at least 2 * pad samples (zero padded) yields enough bins without padding them later.
+    # Computed in single precision, it only drives line lengths on screen.
+    # Rounded up to a 5-smooth length, so odd sizes never fall back to the slow Bluestein path.
+    n = next_fast_len(max(samples.shape[-1], 2 * pad), real=True)
+    fft = np.abs(rfft(samples.astype(np.float32), n=n, axis=-1, workers=-1))
+    norm = np.linalg.norm(fft, axis=-1, keepdims=True)
+    fft *= 1 / np.where(norm == 0, 1, norm)
+    return fft
+
+
+def rms_power(samples: np.ndarray) -> np.ndarray:
+    # samples: int16 samples, either one chunk or a matrix with one chunk per row.
     # Had to be rms but these numbers are more manageable.
-    power = np.power(np.frombuffer(samples, np.int16), 2, dtype=np.int64)
-    rms = np.sqrt(np.mean(power))
-    return np.clip(rms, 0, RMS_POWER_CLIP) / RMS_POWER_CLIP
+    # Sum of squares as a float32 dot product of each chunk with itself: no squared temporary, plenty of precision for
+    # int16 samples.
+    x = samples.astype(np.float32)
+    rms = np.sqrt(np.einsum("...i,...i->...", x, x) / x.shape[-1])
+    return np.minimum(rms, RMS_POWER_CLIP) / RMS_POWER_CLIP
 
 
 class SongMeta:
@@ -82,9 +101,10 @@ class PlayableSong:
 
 class WavSong(VizSong, PlayableSong):
     """
-    Class that manages the song-data about a Song. Uses a mutex to be thread safe.
-    Given a wav file, it pre-loads all of it in chunks of 1024 bytes and computes the fft for each chunk.
-    If the fft generates less than 512 bins, bins of value 0 are added.
+    Class that manages the song-data about a Song. Only the audio thread advances the current chunk, while the stream
+    is running, so reading it needs no lock.
+    Given a wav file, it pre-loads all of it in a single buffer, played in chunks of `CHUNK` frames, and computes the
+    power and the fft of every chunk up front. Each fft is zero padded to at least 512 bins.
 
     Can be played and stopped.
     """
@@ -92,64 +112,58 @@ class WavSong(VizSong, PlayableSong):
     CHUNK = 1024
 
     def __init__(self, path: str):
-        self._pyaudio = pyaudio.PyAudio()
+        self._pyaudio = shared_pyaudio()
         wf = wave.open(path, "rb")
 
         self._path = path
-        self._data = []
-        self._pow = []
-        self._fft = []
         self._index = 0
-        self._lock = threading.Lock()
         self._stream = None
 
         self._sample_width = wf.getsampwidth()
         self._channels = wf.getnchannels()
         self._frame_rate = wf.getframerate()
 
-        chunk = wf.readframes(WavSong.CHUNK)
-        while chunk:
-            self._data.append(chunk)
-            self._pow.append(rms_power(chunk))
-            self._fft.append(normalized_fft(chunk, WavSong.CHUNK // 2))
-            chunk = wf.readframes(WavSong.CHUNK)
-        # Useless sentinels for end of song.
-        self._data.append("")
-        self._pow.append(0)
-        self._fft.append(np.array([0] * WavSong.CHUNK))
-
+        # Read the whole file in a single buffer, chunks are zero copy slices of it.
+        frames = wf.readframes(wf.getnframes())
         wf.close()
+        self._data = memoryview(frames)
+        self._chunk_bytes = WavSong.CHUNK * self._sample_width * self._channels
+
+        # One chunk per row, the last one padded with silence, to compute all the ffts and powers in one go.
+        samples = np.frombuffer(frames, np.int16)
+        chunk_samples = self._chunk_bytes // 2
+        samples = np.pad(samples, (0, -len(samples) % chunk_samples)).reshape(-1, chunk_samples)
+        power = rms_power(samples)
+        fft = normalized_fft(samples, WavSong.CHUNK // 2)
+
+        # Contiguous float32 tables with one row per chunk, the fft property returns views of the rows.
+        # Useless sentinels for end of song (the data slice past the end is empty).
+        self._last = len(power)
+        self._pow = np.zeros(len(power) + 1, dtype=np.float32)
+        self._pow[:-1] = power
+        self._fft = np.zeros((fft.shape[0] + 1, fft.shape[1]), dtype=np.float32)
+        self._fft[:-1] = fft
 
     @property
     def data(self):
         # Get current chunk.
-        self._lock.acquire()
-        data = self._data[self._index]
-        self._lock.release()
-        return data
+        offset = self._index * self._chunk_bytes
+        return self._data[offset:offset + self._chunk_bytes]
 
     @property
     def power(self):
         # Get current chunk's average power.
-        self._lock.acquire()
-        data = self._pow[self._index]
-        self._lock.release()
-        return data
+        return self._pow[self._index]
 
     @property
     def fft(self):
         # Get fft for current chunk.
-        self._lock.acquire()
-        data = self._fft[self._index]
-        self._lock.release()
-        return data
+        return self._fft[self._index]
 
     def next(self):
         # Advance to next chunk.
-        self._lock.acquire()
-        if self._index < len(self._data) - 1:
+        if self._index < self._last:
             self._index += 1
-        self._lock.release()
 
     def play(self, custom_callback=None):
         # Don't play twice.
@@ -157,9 +171,7 @@ class WavSong(VizSong, PlayableSong):
             return
 
         # Reset index.
-        self._lock.acquire()
         self._index = 0
-        self._lock.release()
 
         # Create and start audio stream.
         def callback(in_data, frame_count, time_info, status):
@@ -194,12 +206,7 @@ class WavSong(VizSong, PlayableSong):
         # Stop the song and reset it to its starting point.
         self.stop()
         # Reset index.
-        self._lock.acquire()
         self._index = 0
-        self._lock.release()
-
-    def __del__(self):
-        self._pyaudio.terminate()
 
 
 class SongPair(PlayableSong):
@@ -252,17 +259,20 @@ class EmptySong(PlayableSong, VizSong):
 
     # Stub used for drawing visualizers without sounds.
 
+    # Silence is the same for every instance, build it once.
+    _ZERO_BYTES = b"\x00" * WavSong.CHUNK
+    _ZERO_FFT = np.zeros(WavSong.CHUNK // 2, dtype=np.float32)
+
     def __init__(self):
-        self._data = bytes([0] * WavSong.CHUNK)
-        self._fft = np.array([0] * (WavSong.CHUNK // 2))
+        pass
 
     @property
     def data(self):
-        return self._data
+        return EmptySong._ZERO_BYTES
 
     @property
     def fft(self):
-        return self._fft
+        return EmptySong._ZERO_FFT
 
     @property
     def power(self):
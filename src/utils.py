@@ -1,14 +1,17 @@
 import json
 import random
+import functools
 import numpy as np
+import pygame.font
 import pygame.image
 
-from poke import Pokemon
+from poke import Pokemon, load_pokemon_raw
 from PIL import Image
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from song import SongMeta
 from animation import Bubble
-from typing import List, Tuple
+from typing import Any, List, Tuple
 
 
 def get_songs(file: str) -> List[SongMeta]:
@@ -55,12 +58,15 @@ def get_pokemon(file: str, n: int, restrict: List[str] = None) -> List[Pokemon]:
         sprite = str(Path(file.parent, p["sprite"]))
         pokemon_info[name] = (sprite, cry)
 
-    pokemon = []
     admissible = list(set(pokemon_info.keys()).intersection(set(restrict)) if restrict else set(pokemon_info.keys()))
-    for _ in range(n):
-        name = random.choice(admissible)
-        pokemon.append(Pokemon(name, pokemon_info[name][0], pokemon_info[name][1]))
-    return pokemon
+    names = [random.choice(admissible) for _ in range(n)]
+
+    # Decode the sprites in parallel, Surfaces are only made back here.
+    with ProcessPoolExecutor() as executor:
+        raw = list(executor.map(
+            load_pokemon_raw, names, [pokemon_info[name][0] for name in names], [pokemon_info[name][1] for name in names]
+        ))
+    return [Pokemon(*r) for r in raw]
 
 
 def split_gif(gif_path) -> List[pygame.Surface]:
@@ -85,15 +91,17 @@ def split_gif(gif_path) -> List[pygame.Surface]:
         frame.paste(gif)
 
         matrix = np.transpose(np.array(frame), (1, 0, 2))
-        color = frame.getpixel((0, 0))
-        for i in range(matrix.shape[0]):
-            for j in range(matrix.shape[1]):
-                # Remove background
-                if tuple(matrix[i, j]) == color:
-                    matrix[i, j] = (0, 0, 0)
-                # Avoid originally black pixels to be masked away later.
-                elif tuple(matrix[i, j]) == (0, 0, 0):
-                    matrix[i, j] = (1, 1, 1)
+        # Pad every pixel to 4 bytes and view it as a single uint32, so each test is one compare instead of three.
+        padded = np.zeros(matrix.shape[:-1] + (4,), dtype=np.uint8)
+        padded[..., :3] = matrix
+        packed = padded.view(np.uint32)[..., 0]
+        key = np.array((*frame.getpixel((0, 0)), 0), dtype=np.uint8).view(np.uint32)[0]
+        background = packed == key
+        black = (packed == 0) & ~background
+        # Remove background
+        matrix[background] = (0, 0, 0)
+        # Avoid originally black pixels to be masked away later.
+        matrix[black] = (1, 1, 1)
 
         surface = pygame.surfarray.make_surface(matrix)
         surface.set_colorkey((0, 0, 0))
@@ -109,22 +117,28 @@ def make_silhouette(frames: List[pygame.Surface]) -> List[pygame.Surface]:
     :return: A list of surfaces where every non black pixel has been set to (1,1,1).
     """
     sil_frames = []
+    # Buffers shared by all the frames, which are usually of the same size.
+    nonzero, matrix = None, None
     for f in frames:
-        matrix = pygame.surfarray.pixels3d(f).copy()
-        for i in range(matrix.shape[0]):
-            for j in range(matrix.shape[1]):
-                # Remove background
-                if tuple(matrix[i, j]) != (0, 0, 0):
-                    matrix[i, j] = (1, 1, 1)
+        pixels = pygame.surfarray.pixels3d(f)
+        if nonzero is None or nonzero.shape != pixels.shape:
+            nonzero = np.empty(pixels.shape, dtype=bool)
+            matrix = np.empty(pixels.shape, dtype=np.uint8)
+        np.not_equal(pixels, 0, out=nonzero)
+        # Release the Surface's pixels.
+        del pixels
+
+        # Every non black pixel is set to (1,1,1).
+        matrix[...] = nonzero.any(axis=-1)[..., np.newaxis]
         surface = pygame.surfarray.make_surface(matrix)
         surface.set_colorkey((0, 0, 0))
         sil_frames.append(surface)
     return sil_frames
 
 
-def extend_frame_duration(frames: List[pygame.Surface], desired_fps: int, target_fps: int) -> List[pygame.Surface]:
+def extend_frame_duration(frames: List[Any], desired_fps: int, target_fps: int) -> List[Any]:
     """
-    :param frames: List of surfaces.
+    :param frames: List of surfaces, or of anything standing for them (e.g. indices).
     :param desired_fps: The desired animation frames per second.
     :param target_fps: The target actual frames per second.
     :return: A List containing multiple copies of the original frames to better match the desired animation speed.
@@ -154,15 +168,28 @@ def min_resize(surface: pygame.Surface, target_size: int) -> pygame.Surface:
         return pygame.transform.scale(surface, (new_w, new_h))
 
 
-def make_frames(source: str, size: tuple, pivot: tuple, speed: float):
-    # Make a list of (image, rect) from a starting one, rotating 360 degrees with a certain speed.
-    image = pygame.transform.scale(pygame.image.load(source), size)
-    frames = [(image, image.get_rect(topleft=pivot))]
-    for i in np.arange(0, -360, -speed):
-        rotated = pygame.transform.rotate(frames[0][0], i)
-        new_rect = rotated.get_rect(center=image.get_rect(topleft=pivot).center)
-        frames.append((rotated, new_rect))
-    return frames
+def make_frames(source: str, size: tuple, pivot: tuple,
+                speed: float) -> Tuple[Tuple[pygame.Surface, pygame.Rect], ...]:
+    # Make a tuple of (image, rect) from a starting one, rotating 360 degrees with a certain speed.
+    # Needs the display mode to be set.
+    image = pygame.transform.scale(pygame.image.load(source), size).convert_alpha()
+    rect = image.get_rect(topleft=pivot)
+
+    # Only rotate once per whole degree, frames falling on the same degree share the rotated image.
+    angles, index = np.unique(np.arange(0, -360, -speed).astype(int), return_inverse=True)
+    rotated = []
+    for angle in angles.tolist():
+        rotated_image = pygame.transform.rotate(image, angle)
+        rotated.append((rotated_image, rotated_image.get_rect(center=rect.center)))
+
+    return tuple([(image, rect)] + [rotated[i] for i in index.tolist()])
+
+
+@functools.lru_cache(maxsize=256)
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+    # Render antialiased text, cached so that the same text in the same color is only rasterized once.
+    # Shared between callers, so the Surface must not be drawn on.
+    return font.render(text, True, color)
 
 
 def random_colors():
@@ -172,17 +199,21 @@ def random_colors():
     return background, foreground
 
 
-def random_bubbles(n: int, scene_res: Tuple[int, int]):
-    # Generate n random white bubbles.
-    bubbles = [Bubble(
-        (255, 255, 255),
-        (random.randint(0, scene_res[0]), random.randint(0, scene_res[1])),  # Random position.
-        (random.random() * 6 - 3, random.random() * 6 - 3),  # Random speed from -1 to 1.
-        random.random() * 2 + 1,  # Random growth from 1 to 3
-        random.randint(100, 200),  # Lifespan of 100 to 600 frames
-        random.randint(600, 1200),  # Downtime of 600 to 1200 frames
-        random.randint(1, 100)  # No more than 100 alpha
-    ) for _ in range(n)]
+def random_bubbles(n: int, scene_res: Tuple[int, int], color: Tuple[int, int, int] = (255, 255, 255)):
+    # Generate n random bubbles, white unless told otherwise. All random values are drawn in batches.
+    rng = np.random.default_rng()
+    x = rng.integers(0, scene_res[0], n, endpoint=True).tolist()  # Random position.
+    y = rng.integers(0, scene_res[1], n, endpoint=True).tolist()
+    speed_x = (rng.random(n) * 6 - 3).tolist()  # Random speed from -3 to 3.
+    speed_y = (rng.random(n) * 6 - 3).tolist()
+    growth = (rng.random(n) * 2 + 1).tolist()  # Random growth from 1 to 3
+    lifespan = rng.integers(100, 200, n, endpoint=True).tolist()  # Lifespan of 100 to 200 frames
+    downtime = rng.integers(600, 1200, n, endpoint=True).tolist()  # Downtime of 600 to 1200 frames
+    max_alpha = rng.integers(1, 100, n, endpoint=True).tolist()  # No more than 100 alpha
+    bubbles = [
+        Bubble(color, (x[i], y[i]), (speed_x[i], speed_y[i]), growth[i], lifespan[i], downtime[i], max_alpha[i])
+        for i in range(n)
+    ]
     for b in bubbles:
         b.randomize()
     return bubbles
@@ -46,42 +46,60 @@ class RingVisualizer(Visualizer):
         # Angle between each band.
         self._step = 2 * math.pi / self._bands
 
-        # Angles and therefore (x,y) positions if radius were 1.
+        # Starting angles and therefore (x,y) positions if radius were 1.
         self._angles = np.arange(0, 2 * math.pi, self._step)
-        self._y_unit = np.sin(self._angles)
-        self._x_unit = np.cos(self._angles)
+        self._sin0 = np.sin(self._angles).astype(np.float32)
+        self._cos0 = np.cos(self._angles).astype(np.float32)
+        self._y_unit = self._sin0
+        self._x_unit = self._cos0
+
+        # Rotation of the circle w.r.t. the starting angles.
+        self._phase = 0.0
 
         # Empty fft and power placeholders.
-        self._fft = np.array([0] * self._bands)
-        self._pow = 0
+        self._fft = np.zeros(self._bands, dtype=np.float32)
+        # Scratch buffer for the incoming bands, so smoothing allocates nothing.
+        self._tmp = np.empty(self._bands, dtype=np.float32)
+        self._pow = np.float32(0)
+
+        # Start x, end x, start y and end y of each line, written in place at each frame.
+        self._points = np.empty((4, self._bands), dtype=np.float32)
 
     def draw(self, song: VizSong):
         # Draw the next frame:
         # - Rotate the circle of `speed` radians.
         # - Perform exponential smoothing for fft and power.
 
-        self._angles = (self._angles + self._speed) % 360
-        self._y_unit = np.sin(self._angles)
-        self._x_unit = np.cos(self._angles)
+        # Rotate the starting unit vectors, only two transcendental calls per frame:
+        # sin(a + p) = sin(a)cos(p) + cos(a)sin(p), cos(a + p) = cos(a)cos(p) - sin(a)sin(p)
+        self._phase = (self._phase + self._speed) % (2 * math.pi)
+        cos_p, sin_p = math.cos(self._phase), math.sin(self._phase)
+        self._y_unit = self._sin0 * cos_p + self._cos0 * sin_p
+        self._x_unit = self._cos0 * cos_p - self._sin0 * sin_p
 
         # Exponential smoothing of fft
-        new_fft = song.fft[:self._bands:] * self._max_line_length
-        self._fft = new_fft * (1 - self._smooth_factor) + self._fft * self._smooth_factor
+        np.multiply(song.fft[:self._bands], self._max_line_length * (1 - self._smooth_factor), out=self._tmp)
+        self._fft *= self._smooth_factor
+        self._fft += self._tmp
 
         # Exponential smoothing of radius
         self._pow = song.power * (1 - self._smooth_factor) + self._pow * self._smooth_factor
         radius = self._radius + (self._max_radius - self._radius) * self._pow
 
         # Compute start and end points of spectrogram lines, symmetrically to base radius.
-        start_x = self._x_unit * (self._fft + radius) + self._width / 2
-        end_x = self._x_unit * (radius - self._fft) + self._width / 2
-        start_y = self._y_unit * (self._fft + radius) + self._height / 2
-        end_y = self._y_unit * (radius - self._fft) + self._height / 2
+        outer, inner = radius + self._fft, radius - self._fft
+        points = self._points
+        np.multiply(self._x_unit, outer, out=points[0])
+        np.multiply(self._x_unit, inner, out=points[1])
+        np.multiply(self._y_unit, outer, out=points[2])
+        np.multiply(self._y_unit, inner, out=points[3])
+        points[:2] += self._width / 2
+        points[2:] += self._height / 2
 
-        for i in range(self._bands):
-            pygame.draw.line(
-                self._surface, self.color, (start_x[i], start_y[i]), (end_x[i], end_y[i]), self._line_width
-            )
+        # Plain Python floats for pygame, converted all at once rather than element by element.
+        line, surface, color, line_width = pygame.draw.line, self._surface, self.color, self._line_width
+        for start_x, end_x, start_y, end_y in zip(*points.tolist()):
+            line(surface, color, (start_x, start_y), (end_x, end_y), line_width)
 
 
 class BarVisualizer(Visualizer):
@@ -97,26 +115,28 @@ class BarVisualizer(Visualizer):
 
         # Starting positions of bars. (bands * line_width + spacing * (bands - 1))
         graph_width = bands * line_width + spacing * (bands - 1)
-        self._x_left = np.arange(0, graph_width, spacing + line_width) + spacing + line_width
-        self._x_right = np.arange(self._width, self._width - graph_width, -spacing - line_width) - spacing - line_width
+        self._x_left = (np.arange(0, graph_width, spacing + line_width) + spacing + line_width).tolist()
+        self._x_right = (
+            np.arange(self._width, self._width - graph_width, -spacing - line_width) - spacing - line_width
+        ).tolist()
 
         # Leave a bit of space from the bottom.
         self._start_y = self._height - line_width
 
-        # Empty fft and power placeholders.
-        self._fft = np.array([0] * self._bands)
+        # Empty fft placeholder.
+        self._fft = np.zeros(self._bands, dtype=np.float32)
+        # Scratch buffer for the incoming bands, so smoothing allocates nothing.
+        self._tmp = np.empty(self._bands, dtype=np.float32)
 
     def draw(self, song: VizSong):
         # Exponential smoothing of fft
-        new_fft = song.fft[:self._bands:] * self._max_line_length
-        self._fft = new_fft * (1 - self._smooth_factor) + self._fft * self._smooth_factor
-
-        for i in range(self._bands):
-            pygame.draw.line(
-                self._surface, self.color, (self._x_left[i], self._start_y),
-                (self._x_left[i], self._start_y - self._fft[i]), self._line_width
-            )
-            pygame.draw.line(
-                self._surface, self.color, (self._x_right[i], self._start_y),
-                (self._x_right[i], self._start_y - self._fft[i]), self._line_width
-            )
+        np.multiply(song.fft[:self._bands], self._max_line_length * (1 - self._smooth_factor), out=self._tmp)
+        self._fft *= self._smooth_factor
+        self._fft += self._tmp
+
+        # Plain Python numbers for pygame, converted all at once rather than element by element.
+        line, surface, color, line_width = pygame.draw.line, self._surface, self.color, self._line_width
+        start_y = self._start_y
+        for x_left, x_right, end_y in zip(self._x_left, self._x_right, (start_y - self._fft).tolist()):
+            line(surface, color, (x_left, start_y), (x_left, end_y), line_width)
+            line(surface, color, (x_right, start_y), (x_right, end_y), line_width)